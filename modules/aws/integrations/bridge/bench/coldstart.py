@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Cold-start harness for the Mattermost <-> Outline bridge Lambda.
+
+Starts a fresh Python interpreter per sample, imports lambda/index.py and
+sends it one `/outline create` command, the same work a cold Lambda
+container does before it answers its first request. The command needs the
+Outline API key, so on-demand (lazy) samples load boto3 and fetch the
+secret during the request, and eager samples do it during import. Reports
+import time, time to first response and the bridge's own per-component
+init profile.
+
+Scenarios:
+    lazy   - on-demand container; boto3 and secrets load on first use
+    eager  - provisioned-concurrency container (BRIDGE_EAGER_INIT=true)
+
+Usage:
+    python3 bench/coldstart.py                      # 20 samples per scenario
+    python3 bench/coldstart.py --samples 50 --json coldstart.json
+    python3 bench/coldstart.py --compare coldstart.json
+
+No AWS or Outline access is needed: a local fake server answers both
+documents.create and Secrets Manager GetSecretValue. When boto3 is installed
+it is imported for real, so its cost shows up under "boto3 import", and it
+talks to the fake through AWS_ENDPOINT_URL_SECRETS_MANAGER (boto3 1.28.57 or
+newer). Without boto3, or with --stub-boto3, an in-process stub client
+returns the secrets instead.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda')
+
+SCENARIOS = {
+    'lazy': {},
+    'eager': {'BRIDGE_EAGER_INIT': 'true'},
+}
+
+BASE_ENV = {
+    'OUTLINE_API_KEY_SECRET_ARN': 'arn:aws:secretsmanager:local:000000000000:secret:outline',
+    'MATTERMOST_WEBHOOK_SECRET_ARN': 'arn:aws:secretsmanager:local:000000000000:secret:webhook',
+    'OUTLINE_COLLECTION_ID': 'local',
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'AWS_ACCESS_KEY_ID': 'local',
+    'AWS_SECRET_ACCESS_KEY': 'local',
+    'AWS_MAX_ATTEMPTS': '1',
+}
+
+SECRETS = {'api_key': 'bench', 'webhook_url': 'http://127.0.0.1:9/hooks/bench'}
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    """Answers Outline documents.create and Secrets Manager GetSecretValue."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.headers.get('X-Amz-Target') == 'secretsmanager.GetSecretValue':
+            payload, content_type = {'Name': 'bench', 'SecretString': json.dumps(SECRETS)}, 'application/x-amz-json-1.1'
+        elif self.path == '/api/documents.create':
+            payload, content_type = {'data': {'url': '/doc/cold-start-bench'}}, 'application/json'
+        else:
+            self.send_error(404)
+            return
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_fake_upstream():
+    """Start the fake Outline/Secrets Manager server and return its URL."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeUpstreamHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+CHILD_SCRIPT = r'''
+import importlib.util, json, sys, time, types
+
+stub_boto3 = sys.argv[2] == '1' or importlib.util.find_spec('boto3') is None
+
+class StubSecretsManager:
+    def get_secret_value(self, SecretId):
+        return {'SecretString': sys.argv[3]}
+
+if stub_boto3:
+    sys.modules['boto3'] = types.SimpleNamespace(client=lambda service: StubSecretsManager())
+
+import logging
+logging.disable(logging.CRITICAL)
+
+sys.path.insert(0, sys.argv[1])
+import_started = time.perf_counter()
+import index
+imported = time.perf_counter()
+
+event = {
+    'headers': {'content-type': 'application/x-www-form-urlencoded'},
+    'body': 'text=create+%22Cold+start%22+%22bench%22&user_name=bench&channel_name=bench',
+}
+result = index.handler(event, None)
+answered = time.perf_counter()
+
+text = json.loads(result['body']).get('text', '')
+if not text.startswith('**Document created'):
+    sys.exit(f"create command did not reach Outline: {text}")
+
+print(json.dumps({
+    'import_ms': (imported - import_started) * 1000,
+    'first_response_ms': (answered - import_started) * 1000,
+    'handler_ms': (answered - imported) * 1000,
+    'status': result['statusCode'],
+    'stub_boto3': stub_boto3,
+    'components_ms': index.init_timings,
+}))
+'''
+
+
+def run_sample(scenario_env, stub_boto3, upstream_url):
+    """Run one cold start in a fresh interpreter and return its measurements."""
+    env = dict(
+        os.environ, **BASE_ENV, **scenario_env,
+        OUTLINE_BASE_URL=upstream_url,
+        AWS_ENDPOINT_URL_SECRETS_MANAGER=upstream_url,
+    )
+    started = time.perf_counter()
+    child = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT, LAMBDA_DIR, '1' if stub_boto3 else '0', json.dumps(SECRETS)],
+        env=env, capture_output=True, text=True
+    )
+    if child.returncode != 0:
+        sys.exit(f"cold start sample failed:\n{child.stderr}")
+    sample = json.loads(child.stdout.strip().splitlines()[-1])
+    sample['process_ms'] = (time.perf_counter() - started) * 1000
+    return sample
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Reduce samples to median/p90/max per metric and median per component."""
+    summary = {}
+    for metric in ('import_ms', 'handler_ms', 'first_response_ms', 'process_ms'):
+        values = [s[metric] for s in samples]
+        summary[metric] = {
+            'median': round(statistics.median(values), 2),
+            'p90': round(percentile(values, 90), 2),
+            'max': round(max(values), 2),
+        }
+
+    components = {}
+    for sample in samples:
+        for name, ms in sample['components_ms'].items():
+            components.setdefault(name, []).append(ms)
+    summary['components_ms'] = {
+        name: round(statistics.median(values), 2) for name, values in sorted(components.items())
+    }
+    summary['stub_boto3'] = samples[0]['stub_boto3']
+    return summary
+
+
+def print_summary(name, summary, baseline=None):
+    """Print one scenario, with deltas against a saved baseline if given."""
+    def delta(current, previous):
+        if previous is None:
+            return ''
+        return f"  ({current - previous:+.2f})"
+
+    print(f"\n== {name} (boto3 {'stubbed' if summary['stub_boto3'] else 'real'})")
+    for metric in ('import_ms', 'handler_ms', 'first_response_ms', 'process_ms'):
+        stats = summary[metric]
+        previous = (baseline or {}).get(metric, {}).get('median')
+        print(
+            f"  {metric:<18} median {stats['median']:>8.2f}{delta(stats['median'], previous)}"
+            f"  p90 {stats['p90']:>8.2f}  max {stats['max']:>8.2f}"
+        )
+    print("  init components (median ms):")
+    for component, ms in summary['components_ms'].items():
+        previous = (baseline or {}).get('components_ms', {}).get(component)
+        print(f"    {component:<24} {ms:>8.2f}{delta(ms, previous)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=20, help='cold starts per scenario (default: 20)')
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), action='append',
+                        help='scenario to run (repeatable; default: all)')
+    parser.add_argument('--stub-boto3', action='store_true', help='do not import the real boto3')
+    parser.add_argument('--json', metavar='PATH', help='write the summary to PATH')
+    parser.add_argument('--compare', metavar='PATH', help='show deltas against a summary saved with --json')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    upstream_url = start_fake_upstream()
+
+    results = {}
+    for name in args.scenario or sorted(SCENARIOS):
+        samples = [run_sample(SCENARIOS[name], args.stub_boto3, upstream_url) for _ in range(args.samples)]
+        results[name] = summarize(samples)
+        print_summary(name, results[name], baseline.get(name))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,643 @@
+#!/usr/bin/env python3
+"""
+Load-test harness for the Mattermost <-> Outline bridge Lambda.
+
+Drives a mix of slash commands (form-urlencoded) and Outline webhooks (JSON)
+through the real lambda/index.py handler at a fixed request rate, against
+local fake Outline and Mattermost HTTP servers, and reports latency
+percentiles, throughput and outbound connection counts.
+
+Each simulated Lambda container is a separate process with its own copy of
+the module (so caches, secrets and cold starts behave per container) and
+handles one event at a time. Events are released on schedule to a shared
+queue and picked up by whichever container is free; latency is measured
+from the scheduled time, so queueing behind busy containers is included.
+Secrets Manager is replaced by a stub inside each container.
+
+Usage:
+    python3 bench/loadtest.py                                # 20 req/s for 30 s
+    python3 bench/loadtest.py --rate 50 --containers 8 --duration 60
+    python3 bench/loadtest.py --outline-latency 200 --outline-error-rate 0.05
+    python3 bench/loadtest.py --mix search=8,webhook=2 --json loadtest.json
+"""
+
+import argparse
+import base64
+import email.parser
+import email.policy
+import json
+import multiprocessing
+import os
+import queue
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from coldstart import LAMBDA_DIR, percentile
+
+DEFAULT_MIX = 'create=2,search=4,recent=1,bulk=1,import=1,webhook=6'
+
+TITLE_WORDS = [
+    'architecture', 'backlog', 'budget', 'deploy', 'design', 'incident', 'meeting',
+    'migration', 'notes', 'onboarding', 'planning', 'postmortem', 'release', 'retro',
+    'roadmap', 'runbook', 'security', 'sprint', 'standup', 'review',
+]
+WEBHOOK_EVENTS = ['documents.publish', 'documents.update', 'documents.delete', 'documents.archive']
+
+# Ids Mattermost uses are 26 lowercase alphanumerics
+POST_ID = 'benchpost' + 'x' * 17
+
+
+# =============================================================================
+# Fake upstream servers
+# =============================================================================
+
+class FakeServer(ThreadingHTTPServer):
+    """HTTP server that injects latency/errors and counts connections."""
+
+    daemon_threads = True
+
+    def __init__(self, handler_class, latency_ms, jitter_ms, error_rate, seed):
+        super().__init__(('127.0.0.1', 0), handler_class)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = {}
+        self.errors = 0
+        self.rejected = {}
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def stats(self):
+        with self.lock:
+            return {
+                'connections': self.connections,
+                'requests': sum(self.requests.values()),
+                'injected_errors': self.errors,
+                'rejected': dict(sorted(self.rejected.items())),
+                'by_endpoint': dict(sorted(self.requests.items())),
+            }
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    """Shared request plumbing for the fake servers."""
+
+    # Allow keep-alive so the connection counts reflect what the client does
+    protocol_version = 'HTTP/1.1'
+
+    # A body shorter than its Content-Length would otherwise block forever
+    timeout = 5
+
+    def log_message(self, *args):
+        pass
+
+    def read_body(self):
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            body = b''
+            while True:
+                size = int(self.rfile.readline().split(b';')[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return body
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def begin(self, endpoint):
+        """Count the request, apply latency, and decide whether to fail it."""
+        server = self.server
+        with server.lock:
+            server.requests[endpoint] = server.requests.get(endpoint, 0) + 1
+            delay = server.latency_ms + server.random.uniform(0, server.jitter_ms)
+            failed = server.random.random() < server.error_rate
+            if failed:
+                server.errors += 1
+        time.sleep(delay / 1000)
+        if failed:
+            self.send_json(500, {'ok': False, 'error': 'injected'})
+        return not failed
+
+    def reject(self, endpoint, reason):
+        """Answer 400 and count a malformed request."""
+        with self.server.lock:
+            self.server.rejected[endpoint] = self.server.rejected.get(endpoint, 0) + 1
+        self.send_json(400, {'ok': False, 'error': 'validation_error', 'message': reason})
+        self.close_connection = True
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_bytes(status, body, 'application/json')
+
+    def send_bytes(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeOutlineHandler(FakeHandler):
+    """Subset of the Outline API used by the bridge."""
+
+    def do_POST(self):
+        endpoint = self.path.rsplit('/', 1)[-1]
+        try:
+            body = self.read_body()
+        except (OSError, ValueError) as e:
+            self.reject(endpoint, f'unreadable body: {e}')
+            return
+        if endpoint == 'documents.import':
+            problem = check_import_request(self.headers, body)
+            if problem:
+                self.reject(endpoint, problem)
+                return
+        if not self.begin(endpoint):
+            return
+
+        corpus = self.server.corpus
+        if endpoint in ('collections.list', 'documents.list'):
+            payload = json.loads(body or b'{}')
+            items = self.server.collections if endpoint == 'collections.list' else corpus
+            if payload.get('collectionId'):
+                items = [item for item in items if item.get('collectionId') == payload['collectionId']]
+            offset, limit = payload.get('offset', 0), payload.get('limit', 25)
+            self.send_json(200, {'data': items[offset:offset + limit]})
+        elif endpoint == 'documents.create':
+            title = json.loads(body).get('title', 'Untitled')
+            self.send_json(200, {'data': self.server.new_document(title)})
+        elif endpoint == 'documents.import':
+            self.send_json(200, {'data': self.server.new_document('Imported')})
+        else:
+            self.send_json(404, {'ok': False, 'error': 'not_found'})
+
+
+def check_import_request(headers, body):
+    """
+    Validate a documents.import multipart upload the way a strict server would.
+
+    Returns a description of the first problem found, or None if the body is
+    well framed and has the collectionId, publish and file parts.
+    """
+    content_type = headers.get('Content-Type', '')
+    if not content_type.startswith('multipart/form-data') or 'boundary=' not in content_type:
+        return f'bad content type: {content_type!r}'
+    boundary = content_type.split('boundary=', 1)[1].strip('"').encode()
+
+    if not body.startswith(b'--' + boundary + b'\r\n'):
+        return 'body does not start with the boundary'
+    if not body.endswith(b'\r\n--' + boundary + b'--\r\n'):
+        return 'body does not end with the closing boundary (truncated or overlong)'
+
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f'Content-Type: {content_type}\r\n\r\n'.encode() + body
+    )
+    if not message.is_multipart() or message.defects:
+        return f'malformed multipart body: {message.defects}'
+
+    parts = {part.get_param('name', header='content-disposition'): part for part in message.iter_parts()}
+    for name in ('collectionId', 'publish', 'file'):
+        if name not in parts:
+            return f'missing {name} part'
+    if not parts['file'].get_filename():
+        return 'file part has no filename'
+    if not parts['file'].get_content().strip():
+        return 'file part is empty'
+    return None
+
+
+class FakeMattermostHandler(FakeHandler):
+    """Incoming webhook plus the file endpoints used by /outline import."""
+
+    def do_POST(self):
+        self.read_body()
+        if self.begin('hooks'):
+            self.send_bytes(200, b'ok', 'text/plain')
+
+    def do_GET(self):
+        if self.path.endswith('/files/info'):
+            if self.begin('posts.files.info'):
+                self.send_json(200, [{'id': 'benchfile', 'name': 'bench.md', 'extension': 'md'}])
+        elif '/files/' in self.path:
+            if self.begin('files.get'):
+                self.send_bytes(200, self.server.attachment, 'text/markdown')
+        elif '/members/' in self.path:
+            if self.begin('channels.members'):
+                self.send_json(200, {'channel_id': 'benchchannel', 'user_id': self.path.rsplit('/', 1)[-1]})
+        elif '/posts/' in self.path:
+            if self.begin('posts.get'):
+                self.send_json(200, {'id': POST_ID, 'channel_id': 'benchchannel'})
+        else:
+            self.send_json(404, {'status_code': 404})
+
+
+def build_corpus(size, seed):
+    """Generate document metadata for the fake Outline's list endpoints."""
+    rng = random.Random(seed)
+    documents = []
+    for i in range(size):
+        title = ' '.join(rng.sample(TITLE_WORDS, 3)).title()
+        documents.append({
+            'id': f'doc-{i}',
+            'title': title,
+            'url': f'/doc/{title.lower().replace(" ", "-")}-{i}',
+            'collectionId': f'col-{i % 5}',
+            'updatedAt': f'2026-01-01T00:00:{i % 60:02d}.{i:06d}Z',
+        })
+    return documents
+
+
+def start_servers(args):
+    """Start the fake Outline and Mattermost servers on background threads."""
+    outline = FakeServer(FakeOutlineHandler, args.outline_latency, args.outline_jitter,
+                         args.outline_error_rate, args.seed)
+    outline.corpus = build_corpus(args.corpus_size, args.seed)
+    outline.collections = [{'id': f'col-{i}', 'name': f'Collection {i}'} for i in range(5)]
+    outline.created = 0
+
+    def new_document(title):
+        with outline.lock:
+            outline.created += 1
+            number = outline.created
+        return {'id': f'new-{number}', 'title': title, 'url': f'/doc/new-{number}'}
+
+    outline.new_document = new_document
+
+    mattermost = FakeServer(FakeMattermostHandler, args.mattermost_latency, args.mattermost_jitter,
+                            args.mattermost_error_rate, args.seed + 1)
+    mattermost.attachment = ('# Bench attachment\n\n' + 'lorem ipsum ' * (args.attachment_kb * 85)).encode()
+
+    for server in (outline, mattermost):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return outline, mattermost
+
+
+# =============================================================================
+# Event generation
+# =============================================================================
+
+def parse_mix(text):
+    """Parse 'kind=weight,...' into a dict of positive weights."""
+    mix = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        if kind not in EVENT_BUILDERS:
+            raise argparse.ArgumentTypeError(f"unknown event kind: {kind}")
+        if float(weight or 1) > 0:
+            mix[kind] = float(weight or 1)
+    if not mix:
+        raise argparse.ArgumentTypeError("mix has no positive weights")
+    return mix
+
+
+def slash_event(text, rng, base64_fraction):
+    body = urllib.parse.urlencode({
+        'text': text, 'token': 'bench', 'user_id': 'benchuser', 'user_name': 'bench', 'channel_name': 'load-test'
+    })
+    return api_event('application/x-www-form-urlencoded', body, rng, base64_fraction)
+
+
+def api_event(content_type, body, rng, base64_fraction):
+    """Wrap a body as an API Gateway HTTP API (payload 2.0) event."""
+    encoded = rng.random() < base64_fraction
+    return {
+        'headers': {'content-type': content_type},
+        'body': base64.b64encode(body.encode()).decode() if encoded else body,
+        'isBase64Encoded': encoded,
+    }
+
+
+def build_create(rng, corpus, base64_fraction):
+    title = ' '.join(rng.sample(TITLE_WORDS, 2)).title()
+    return slash_event(f'create "{title}" "## Notes\\n- generated by loadtest"', rng, base64_fraction)
+
+
+def build_search(rng, corpus, base64_fraction):
+    words = rng.choice(corpus)['title'].lower().split()
+    query = ' '.join(word[:rng.randint(3, len(word))] for word in rng.sample(words, rng.randint(1, 2)))
+    return slash_event(f'search {query}', rng, base64_fraction)
+
+
+def build_recent(rng, corpus, base64_fraction):
+    return slash_event(f'recent {rng.randint(1, 20)}', rng, base64_fraction)
+
+
+def build_bulk(rng, corpus, base64_fraction):
+    lines = [f'"Bulk {rng.choice(TITLE_WORDS)} {i}" "Body {i}"' for i in range(rng.randint(2, 5))]
+    return slash_event('bulk\n' + '\n'.join(lines), rng, base64_fraction)
+
+
+def build_import(rng, corpus, base64_fraction):
+    return slash_event(f'import https://mm.local/team/pl/{POST_ID}', rng, base64_fraction)
+
+
+def build_webhook(rng, corpus, base64_fraction):
+    event = rng.choice(WEBHOOK_EVENTS)
+    doc = dict(rng.choice(corpus), publishedAt='2026-01-01T00:00:00.000Z')
+    # Outline sends the document's current state; the bridge caches by it
+    if event == 'documents.delete':
+        doc['deletedAt'] = '2026-01-02T00:00:00.000Z'
+    elif event == 'documents.archive':
+        doc['archivedAt'] = '2026-01-02T00:00:00.000Z'
+    payload = {'event': event, 'payload': {'model': doc}}
+    return api_event('application/json', json.dumps(payload), rng, base64_fraction)
+
+
+EVENT_BUILDERS = {
+    'create': build_create,
+    'search': build_search,
+    'recent': build_recent,
+    'bulk': build_bulk,
+    'import': build_import,
+    'webhook': build_webhook,
+}
+
+
+def generate_events(args, corpus):
+    """Build the (kind, event) sequence for the run, deterministically."""
+    rng = random.Random(args.seed)
+    kinds = list(args.mix)
+    weights = [args.mix[kind] for kind in kinds]
+    total = int(args.rate * args.duration)
+    events = []
+    for _ in range(total):
+        kind = rng.choices(kinds, weights)[0]
+        events.append((kind, EVENT_BUILDERS[kind](rng, corpus, args.base64_fraction)))
+    return events
+
+
+# =============================================================================
+# Simulated Lambda containers
+# =============================================================================
+
+def outcome(result):
+    """Classify a handler result as ok, http_error or command_failed."""
+    if result.get('statusCode') != 200:
+        return 'http_error'
+    body = json.loads(result.get('body') or '{}')
+    text = body.get('text', '')
+    if text.startswith(('Failed', 'Error:')) or '**Failed**' in text:
+        return 'command_failed'
+    return 'ok'
+
+
+def container_main(container_id, env, secrets_latency_ms, work, results, ready, start):
+    """Run one simulated Lambda container until it receives a sentinel."""
+    import logging
+    import types
+
+    os.environ.update(env)
+    secret_calls = []
+
+    class StubSecretsManager:
+        def get_secret_value(self, SecretId):
+            secret_calls.append(SecretId)
+            time.sleep(secrets_latency_ms / 1000)
+            return {'SecretString': json.dumps({
+                'api_key': 'bench',
+                'webhook_url': env['BENCH_MATTERMOST_WEBHOOK_URL'],
+                'token': 'bench',
+            })}
+
+    sys.modules['boto3'] = types.SimpleNamespace(client=lambda service: StubSecretsManager())
+    sys.path.insert(0, LAMBDA_DIR)
+    logging.disable(logging.CRITICAL)
+    import_started = time.monotonic()
+    import index
+    import_ms = (time.monotonic() - import_started) * 1000
+
+    ready.put(container_id)
+    start.wait()
+
+    samples = []
+    while True:
+        item = work.get()
+        if item is None:
+            break
+        scheduled, kind, event = item
+        started = time.monotonic()
+        try:
+            status = outcome(index.handler(event, None))
+        except Exception:
+            status = 'exception'
+        finished = time.monotonic()
+        sample = {
+            'kind': kind,
+            'status': status,
+            'latency_ms': (finished - scheduled) * 1000,
+            'service_ms': (finished - started) * 1000,
+            'finished': finished,
+            'cold': not samples,
+        }
+        if sample['cold']:
+            # Import ran before traffic started; add it back for the real cold start
+            sample['import_ms'] = import_ms
+            sample['cold_start_ms'] = import_ms + sample['service_ms']
+        samples.append(sample)
+
+    results.put({'container': container_id, 'samples': samples, 'secret_calls': len(secret_calls)})
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+def latency_stats(samples, key='latency_ms'):
+    values = [s[key] for s in samples]
+    return {
+        'count': len(values),
+        'p50': round(percentile(values, 50), 2),
+        'p95': round(percentile(values, 95), 2),
+        'p99': round(percentile(values, 99), 2),
+        'max': round(max(values), 2),
+        'mean': round(statistics.mean(values), 2),
+        'errors': sum(1 for s in samples if s['status'] != 'ok'),
+    }
+
+
+def build_report(args, samples, started, secret_calls, outline, mattermost):
+    elapsed = max(s['finished'] for s in samples) - started
+    outbound = outline.stats()['connections'] + mattermost.stats()['connections']
+    by_kind = {}
+    for sample in samples:
+        by_kind.setdefault(sample['kind'], []).append(sample)
+
+    return {
+        'config': {
+            'rate': args.rate,
+            'duration_s': args.duration,
+            'containers': args.containers,
+            'mix': args.mix,
+            'outline_latency_ms': args.outline_latency,
+            'outline_error_rate': args.outline_error_rate,
+            'mattermost_latency_ms': args.mattermost_latency,
+            'mattermost_error_rate': args.mattermost_error_rate,
+            'secrets_latency_ms': args.secrets_latency,
+        },
+        'requests': len(samples),
+        'elapsed_s': round(elapsed, 2),
+        'throughput_rps': round(len(samples) / elapsed, 2),
+        'latency_ms': latency_stats(samples),
+        'service_ms': latency_stats(samples, 'service_ms'),
+        'cold_import_ms': latency_stats([s for s in samples if s['cold']], 'import_ms'),
+        'first_request_ms': latency_stats([s for s in samples if s['cold']], 'service_ms'),
+        'cold_start_ms': latency_stats([s for s in samples if s['cold']], 'cold_start_ms'),
+        'by_kind': {kind: latency_stats(group) for kind, group in sorted(by_kind.items())},
+        'outcomes': {
+            status: sum(1 for s in samples if s['status'] == status)
+            for status in sorted({s['status'] for s in samples})
+        },
+        'outbound': {
+            'outline': outline.stats(),
+            'mattermost': mattermost.stats(),
+            'secrets_manager_calls': secret_calls,
+            'connections_per_request': round(outbound / len(samples), 2),
+        },
+    }
+
+
+def print_report(report):
+    def row(name, stats):
+        print(
+            f"  {name:<12} {stats['count']:>6}  p50 {stats['p50']:>8.2f}  p95 {stats['p95']:>8.2f}"
+            f"  p99 {stats['p99']:>8.2f}  max {stats['max']:>8.2f}  errors {stats['errors']}"
+        )
+
+    config = report['config']
+    print(
+        f"\n{report['requests']} requests in {report['elapsed_s']} s "
+        f"(target {config['rate']} req/s, achieved {report['throughput_rps']} req/s, "
+        f"{config['containers']} containers)"
+    )
+    print("\nLatency from scheduled time (ms):")
+    row('all', report['latency_ms'])
+    for kind, stats in report['by_kind'].items():
+        row(kind, stats)
+    print("\nHandler service time (ms):")
+    row('all', report['service_ms'])
+    print("\nCold start per container (ms):")
+    row('import', report['cold_import_ms'])
+    row('1st request', report['first_request_ms'])
+    row('total', report['cold_start_ms'])
+
+    print("\nOutcomes: " + ', '.join(f"{k}={v}" for k, v in report['outcomes'].items()))
+
+    outbound = report['outbound']
+    print("\nOutbound:")
+    for name in ('outline', 'mattermost'):
+        stats = outbound[name]
+        endpoints = ', '.join(f"{k}={v}" for k, v in stats['by_endpoint'].items())
+        print(
+            f"  {name:<12} connections {stats['connections']:>6}  requests {stats['requests']:>6}"
+            f"  injected errors {stats['injected_errors']}  ({endpoints})"
+        )
+        for endpoint, count in stats['rejected'].items():
+            print(f"  {'':<12} REJECTED {count} malformed {endpoint} requests")
+    print(f"  secrets manager calls {outbound['secrets_manager_calls']}")
+    print(f"  connections per request {outbound['connections_per_request']}")
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rate', type=float, default=20, help='requests per second (default: 20)')
+    parser.add_argument('--duration', type=float, default=30, help='seconds of traffic (default: 30)')
+    parser.add_argument('--containers', type=int, default=4, help='simulated Lambda containers (default: 4)')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f'event kinds and weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--base64-fraction', type=float, default=0.2,
+                        help='fraction of events sent base64-encoded (default: 0.2)')
+    parser.add_argument('--corpus-size', type=int, default=500, help='documents in the fake Outline (default: 500)')
+    parser.add_argument('--attachment-kb', type=int, default=256, help='size of imported attachments (default: 256)')
+    parser.add_argument('--outline-latency', type=float, default=50, help='Outline base latency ms (default: 50)')
+    parser.add_argument('--outline-jitter', type=float, default=25, help='Outline extra random latency ms (default: 25)')
+    parser.add_argument('--outline-error-rate', type=float, default=0.0, help='fraction of Outline calls that fail')
+    parser.add_argument('--mattermost-latency', type=float, default=30, help='Mattermost base latency ms (default: 30)')
+    parser.add_argument('--mattermost-jitter', type=float, default=15,
+                        help='Mattermost extra random latency ms (default: 15)')
+    parser.add_argument('--mattermost-error-rate', type=float, default=0.0,
+                        help='fraction of Mattermost calls that fail')
+    parser.add_argument('--secrets-latency', type=float, default=40,
+                        help='stub Secrets Manager latency ms (default: 40)')
+    parser.add_argument('--seed', type=int, default=42, help='random seed (default: 42)')
+    parser.add_argument('--json', metavar='PATH', help='write the report to PATH')
+    args = parser.parse_args()
+
+    outline, mattermost = start_servers(args)
+    events = generate_events(args, outline.corpus)
+
+    env = {
+        'OUTLINE_API_KEY_SECRET_ARN': 'arn:aws:secretsmanager:local:000000000000:secret:outline',
+        'MATTERMOST_WEBHOOK_SECRET_ARN': 'arn:aws:secretsmanager:local:000000000000:secret:webhook',
+        'MATTERMOST_BOT_TOKEN_SECRET_ARN': 'arn:aws:secretsmanager:local:000000000000:secret:bot',
+        'MATTERMOST_SLASH_TOKEN_SECRET_ARN': 'arn:aws:secretsmanager:local:000000000000:secret:slash',
+        'OUTLINE_BASE_URL': outline.url,
+        'OUTLINE_COLLECTION_ID': 'col-0',
+        'OUTLINE_SEARCH_COLLECTION_IDS': ','.join(c['id'] for c in outline.collections),
+        'MATTERMOST_BASE_URL': mattermost.url,
+        'BENCH_MATTERMOST_WEBHOOK_URL': f"{mattermost.url}/hooks/bench",
+    }
+
+    ctx = multiprocessing.get_context('spawn')
+    work, results, ready, start = ctx.Queue(), ctx.Queue(), ctx.Queue(), ctx.Event()
+    containers = [
+        ctx.Process(target=container_main,
+                    args=(i, env, args.secrets_latency, work, results, ready, start))
+        for i in range(args.containers)
+    ]
+    for process in containers:
+        process.start()
+    for _ in containers:
+        ready.get()
+
+    print(f"Sending {len(events)} events at {args.rate} req/s to {args.containers} containers...")
+    start.set()
+    started = time.monotonic()
+    interval = 1 / args.rate
+    for i, (kind, event) in enumerate(events):
+        scheduled = started + i * interval
+        delay = scheduled - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        work.put((scheduled, kind, event))
+    for _ in containers:
+        work.put(None)
+
+    samples, secret_calls = [], 0
+    for _ in containers:
+        try:
+            result = results.get(timeout=args.duration + 600)
+        except queue.Empty:
+            sys.exit("Timed out waiting for containers to finish")
+        samples.extend(result['samples'])
+        secret_calls += result['secret_calls']
+    for process in containers:
+        process.join()
+
+    report = build_report(args, samples, started, secret_calls, outline, mattermost)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
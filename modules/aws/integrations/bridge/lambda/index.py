@@ -8,31 +8,160 @@ This Lambda function serves as a multiplexer that handles:
 Request routing is based on Content-Type:
 - application/x-www-form-urlencoded → Mattermost slash command
 - application/json → Outline webhook
+
+Search and lookup commands are answered from a per-container metadata cache
+of the searchable collections, refreshed lazily from the Outline API and
+updated by the webhooks that container receives.
+
+Cold starts are kept short: boto3 and the thread pool are imported on first
+use, parsers are compiled once at import, and the time spent initializing
+each component is logged when the first invocation of a container ends.
 """
 
+import time
+INIT_STARTED = time.perf_counter()
+
+import base64
 import json
 import os
+import uuid
+import bisect
+import hmac
+import itertools
 import urllib.parse
 import urllib.request
 import logging
 import re
-import boto3
+import threading
+from contextlib import contextmanager, nullcontext
 from functools import lru_cache
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Secrets Manager client (reused across invocations)
-secrets_client = boto3.client('secretsmanager')
+# Cold-start profiling: component -> milliseconds spent initializing it.
+# Components do not overlap, so they add up to the profiled init time.
+STDLIB_IMPORTED = time.perf_counter()
+init_timings = {'stdlib imports': round((STDLIB_IMPORTED - INIT_STARTED) * 1000, 2)}
+init_reported = False
+
+# Provisioned concurrency initializes ahead of traffic, so pay for heavy
+# imports and secrets up front; on-demand containers load them lazily.
+EAGER_INIT = (
+    os.environ.get('AWS_LAMBDA_INITIALIZATION_TYPE') == 'provisioned-concurrency'
+    or os.environ.get('BRIDGE_EAGER_INIT', 'false').lower() == 'true'
+)
+
+# boto3 clients by service (created on first use, reused across invocations)
+boto3_clients = {}
+boto3_clients_lock = threading.Lock()
+
+# Outline metadata cache (reused across invocations of a warm container)
+CACHE_TTL_SECONDS = int(os.environ.get('OUTLINE_CACHE_TTL_SECONDS', '300'))
+CACHE_MAX_DOCUMENTS = int(os.environ.get('OUTLINE_CACHE_MAX_DOCUMENTS', '1000'))
+CACHE_MAX_COLLECTIONS = int(os.environ.get('OUTLINE_CACHE_MAX_COLLECTIONS', '200'))
+CACHE_RETRY_SECONDS = int(os.environ.get('OUTLINE_CACHE_RETRY_SECONDS', '30'))
+OUTLINE_PAGE_SIZE = 100
+SEARCH_RESULT_LIMIT = 10
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Bulk and large-document import
+BULK_MAX_DOCUMENTS = int(os.environ.get('BULK_MAX_DOCUMENTS', '20'))
+BULK_MAX_CONCURRENCY = int(os.environ.get('BULK_MAX_CONCURRENCY', '4'))
+IMPORT_THRESHOLD_BYTES = int(os.environ.get('OUTLINE_IMPORT_THRESHOLD_BYTES', '65536'))
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Per-call Outline timeouts, and the time budget for bulk jobs. Jobs run in
+# an async self-invocation when possible; otherwise they run inside the
+# slash-command request, which API Gateway cuts off after 30 seconds.
+CREATE_TIMEOUT_SECONDS = 10
+IMPORT_TIMEOUT_SECONDS = 30
+BULK_INLINE_SECONDS = 20
+BULK_MIN_ITEM_SECONDS = 3
+BULK_REPORT_SECONDS = 15
+MARKDOWN_EXTENSIONS = ('md', 'markdown')
+
+DOCUMENT_PATTERN = re.compile(r'"([^"]+)"(?:\s+"([^"]*)")?')
+CREATE_PATTERN = re.compile(r'create\s+' + DOCUMENT_PATTERN.pattern)
+POST_ID_PATTERN = re.compile(r'(?<![a-z0-9])([a-z0-9]{26})(?![a-z0-9])')
+
+
+def new_metadata_cache():
+    """Return an empty metadata cache structure."""
+    return {
+        'loaded_at': 0.0,   # 0 until the first successful load
+        'stale': False,     # set by collection webhooks to force a reload
+        'failed_at': 0.0,   # last failed refresh, for retry backoff
+        'collections': {},  # collection id -> name
+        'documents': {},    # document id -> {id, title, url, collectionId, updatedAt}
+        'tokens': {},       # title token -> set of document ids
+        'sorted_tokens': [],
+    }
+
+
+metadata_cache = new_metadata_cache()
+
+
+@contextmanager
+def init_timer(component):
+    """Record how long initializing a component takes, in milliseconds."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        init_timings[component] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def report_init_timings(context):
+    """Log the init profile once per container, when its first invocation ends."""
+    global init_reported
+    if init_reported:
+        return
+    init_reported = True
+
+    logger.info(json.dumps({
+        "message": "bridge init profile",
+        "initialization_type": os.environ.get('AWS_LAMBDA_INITIALIZATION_TYPE', 'on-demand'),
+        "eager_init": EAGER_INIT,
+        "through_first_invocation_ms": round((time.perf_counter() - INIT_STARTED) * 1000, 2),
+        "components_ms": init_timings,
+        "request_id": getattr(context, 'aws_request_id', None),
+    }))
+
+
+def get_boto3_client(service):
+    """Return a boto3 client, importing boto3 on first use."""
+    # boto3's default session is not thread-safe; bulk commands call this from workers
+    with boto3_clients_lock:
+        client = boto3_clients.get(service)
+        if client is None:
+            # Only the first client pays for (and records) the boto3 import
+            with init_timer('boto3 import') if not boto3_clients else nullcontext():
+                import boto3
+            with init_timer(f'{service} client'):
+                client = boto3_clients[service] = boto3.client(service)
+    return client
 
 
 @lru_cache(maxsize=4)
+def fetch_secret(secret_arn):
+    """
+    Fetch and cache a JSON secret from Secrets Manager.
+
+    Errors propagate, and lru_cache does not cache them, so a failed fetch
+    is retried on the next call instead of being remembered for the life of
+    the container.
+    """
+    with init_timer(f"secret {secret_arn.rsplit(':', 1)[-1]}"):
+        response = get_boto3_client('secretsmanager').get_secret_value(SecretId=secret_arn)
+    return json.loads(response['SecretString'])
+
+
 def get_secret(secret_arn, key):
-    """Fetch and cache a secret value from Secrets Manager."""
+    """Return one key of a cached secret, or '' if it cannot be fetched."""
     try:
-        response = secrets_client.get_secret_value(SecretId=secret_arn)
-        secret_data = json.loads(response['SecretString'])
-        return secret_data.get(key, '')
+        return fetch_secret(secret_arn).get(key, '')
     except Exception as e:
         logger.error(f"Failed to get secret {secret_arn}: {str(e)}")
         return ''
@@ -54,9 +183,50 @@ def get_mattermost_webhook_url():
     return ''
 
 
+def get_mattermost_bot_token():
+    """Get Mattermost bot access token from Secrets Manager."""
+    secret_arn = os.environ.get('MATTERMOST_BOT_TOKEN_SECRET_ARN', '')
+    if secret_arn:
+        return get_secret(secret_arn, 'token')
+    return ''
+
+
+def get_mattermost_slash_token():
+    """Get the Mattermost slash command token from Secrets Manager."""
+    secret_arn = os.environ.get('MATTERMOST_SLASH_TOKEN_SECRET_ARN', '')
+    if secret_arn:
+        return get_secret(secret_arn, 'token')
+    return ''
+
+
+def warm_up():
+    """Load the client and secrets a request would otherwise load lazily."""
+    # Each step records its own component; no outer timer, to avoid counting twice
+    get_boto3_client('secretsmanager')
+    get_outline_api_key()
+    get_mattermost_webhook_url()
+
+
+def decode_body(event, default=''):
+    """Return the request body, decoding it if API Gateway base64-encoded it."""
+    body = event.get('body') or default
+    if event.get('isBase64Encoded', False):
+        body = base64.b64decode(body).decode('utf-8')
+    return body
+
+
 def handler(event, context):
     """Main Lambda handler - routes requests to appropriate handler."""
     try:
+        # Bulk job handed off by a slash command (async self-invocation)
+        if 'bulk_job' in event:
+            return handle_bulk_job(event['bulk_job'], context)
+
+        # Scheduled or manual warmup ping: initialize, but do no work
+        if event.get('warmup'):
+            warm_up()
+            return response(200, {"status": "warm", "components_ms": init_timings})
+
         headers = event.get('headers', {})
         # Headers may be lowercase in API Gateway HTTP API
         content_type = headers.get('content-type', headers.get('Content-Type', ''))
@@ -79,35 +249,71 @@ def handler(event, context):
         logger.error(f"Handler error: {str(e)}", exc_info=True)
         return response(500, {"error": "Internal server error"})
 
+    finally:
+        # After the request, so components loaded lazily by it are included
+        report_init_timings(context)
+
 
 def handle_slash_command(event):
     """
-    Handle Mattermost slash command to create Outline document.
-
-    Syntax: /outline create "Title" "Content markdown here"
+    Handle Mattermost slash command.
+
+    Syntax:
+        /outline create "Title" "Content markdown here"
+        /outline bulk  (followed by one "Title" "Content" line per document)
+        /outline import <post link> [<post link> ...]
+        /outline search <query>
+        /outline recent [count]
     """
     try:
-        body = event.get('body', '')
-
-        # Handle base64 encoded body
-        if event.get('isBase64Encoded', False):
-            import base64
-            body = base64.b64decode(body).decode('utf-8')
-
+        body = decode_body(event)
         params = dict(urllib.parse.parse_qsl(body))
         text = params.get('text', '').strip()
         user_name = params.get('user_name', 'Unknown')
+        user_id = params.get('user_id', '')
         channel_name = params.get('channel_name', 'Unknown')
+        response_url = params.get('response_url', '')
 
         logger.info(f"Slash command from {user_name} in #{channel_name}: {text[:100]}")
 
+        parts = text.split(None, 1)
+        subcommand = parts[0].lower() if parts else ''
+        argument = parts[1] if len(parts) > 1 else ''
+
+        if subcommand == 'search':
+            return handle_search_command(argument.strip())
+
+        if subcommand == 'recent':
+            return handle_recent_command(argument.strip())
+
+        if subcommand in ('bulk', 'import'):
+            # These act on the invoking user's behalf with the bot token and
+            # reply via response_url, so the request itself must be trusted
+            if not slash_token_valid(params.get('token', '')):
+                logger.warning(f"Rejected {subcommand} command with an invalid slash command token")
+                return mattermost_response("This command could not be verified.", ephemeral=True)
+            if response_url and not is_mattermost_url(response_url):
+                logger.warning(f"Rejected {subcommand} command with response_url {response_url[:100]}")
+                return mattermost_response("Invalid response URL.", ephemeral=True)
+
+        if subcommand == 'bulk':
+            return handle_bulk_command(argument, user_name, channel_name, response_url)
+
+        if subcommand == 'import':
+            return handle_import_command(argument, user_id, user_name, channel_name, response_url)
+
         # Parse command: create "Title" "Content"
         # Support both: create "Title" "Content" and create "Title"
-        match = re.match(r'create\s+"([^"]+)"(?:\s+"([^"]*)")?', text)
+        match = CREATE_PATTERN.match(text)
 
         if not match:
             return mattermost_response(
-                "Usage: `/outline create \"Document Title\" \"Document content in markdown\"`\n\n"
+                "Usage:\n"
+                "- `/outline create \"Document Title\" \"Document content in markdown\"`\n"
+                "- `/outline bulk` followed by one `\"Title\" \"Content\"` line per document\n"
+                "- `/outline import <post link>` to import a post's markdown attachments\n"
+                "- `/outline search <query>`\n"
+                "- `/outline recent [count]`\n\n"
                 "Example: `/outline create \"Meeting Notes\" \"## Attendees\\n- Alice\\n- Bob\"`"
             )
 
@@ -133,6 +339,329 @@ def handle_slash_command(event):
         return mattermost_response(f"Error: {str(e)}", ephemeral=True)
 
 
+def slash_token_valid(token):
+    """Check a slash command's token against the one Mattermost issued for it."""
+    expected = get_mattermost_slash_token()
+    if not expected:
+        logger.error("Missing Mattermost slash command token")
+        return False
+    return hmac.compare_digest(token.encode('utf-8'), expected.encode('utf-8'))
+
+
+def is_mattermost_url(url):
+    """Check that a URL points into the configured Mattermost server."""
+    base = urllib.parse.urlsplit(os.environ.get('MATTERMOST_BASE_URL', ''))
+    target = urllib.parse.urlsplit(url)
+    return bool(base.netloc) and (
+        target.scheme == base.scheme
+        and target.netloc == base.netloc
+        and target.path.startswith(base.path.rstrip('/') + '/')
+    )
+
+
+def parse_bulk_documents(argument):
+    """
+    Parse the lines of a bulk command.
+
+    Returns (documents, skipped): (title, content) pairs for lines matching
+    `"Title" "Content"` or `"Title"`, and the non-blank lines that did not.
+    """
+    documents = []
+    skipped = []
+    for line in argument.splitlines():
+        line = line.strip()
+        match = DOCUMENT_PATTERN.fullmatch(line)
+        if match:
+            documents.append((match.group(1), match.group(2) or ''))
+        elif line:
+            skipped.append(line)
+    return documents, skipped
+
+
+def parse_post_ids(argument):
+    """Return the unique Mattermost post ids in an import command, in order."""
+    return list(dict.fromkeys(POST_ID_PATTERN.findall(argument)))
+
+
+def handle_bulk_command(argument, user_name, channel_name, response_url=''):
+    """Create one document per `"Title" "Content"` line of a bulk command."""
+    documents, skipped = parse_bulk_documents(argument)
+
+    if not documents:
+        return mattermost_response(
+            "Usage: `/outline bulk` followed by one `\"Title\" \"Content\"` line per document",
+            ephemeral=True
+        )
+
+    if len(documents) > BULK_MAX_DOCUMENTS:
+        return mattermost_response(
+            f"Too many documents ({len(documents)}); the limit is {BULK_MAX_DOCUMENTS} per command.",
+            ephemeral=True
+        )
+
+    return start_bulk_job({
+        'kind': 'bulk',
+        'items': documents,
+        'skipped': skipped,
+        'user_name': user_name,
+        'channel_name': channel_name,
+        'response_url': response_url,
+    })
+
+
+def handle_import_command(argument, user_id, user_name, channel_name, response_url=''):
+    """
+    Import the markdown attachments of one or more Mattermost posts.
+
+    The bot token can read more than the invoking user, so each post is
+    only imported if the user is a member of the channel it was posted in.
+    """
+    post_ids = parse_post_ids(argument)
+    if not post_ids:
+        return mattermost_response(
+            "Usage: `/outline import <post link> [<post link> ...]`\n\n"
+            "Attach `.md` files to a post, copy its link, then run the command.",
+            ephemeral=True
+        )
+
+    # Each post costs several Mattermost calls before the reply is sent
+    if len(post_ids) > BULK_MAX_DOCUMENTS:
+        return mattermost_response(
+            f"Too many posts ({len(post_ids)}); the limit is {BULK_MAX_DOCUMENTS} per command.",
+            ephemeral=True
+        )
+
+    if not user_id:
+        return mattermost_response("Cannot verify the requesting user.", ephemeral=True)
+
+    try:
+        denied = [post_id for post_id in post_ids if not user_can_read_post(user_id, post_id)]
+        if denied:
+            logger.warning(f"User {user_id} denied import of posts {denied}")
+            return mattermost_response(
+                "You can only import posts from channels you are a member of.",
+                ephemeral=True
+            )
+
+        files = []
+        for post_id in post_ids:
+            files.extend(list_markdown_attachments(post_id))
+    except urllib.error.HTTPError as e:
+        logger.error(f"Mattermost API error: {e.code} - {e.read().decode()}")
+        return mattermost_response(
+            "Failed to read post attachments. Check Lambda logs for details.",
+            ephemeral=True
+        )
+
+    if not files:
+        return mattermost_response("No markdown attachments found.", ephemeral=True)
+
+    if len(files) > BULK_MAX_DOCUMENTS:
+        return mattermost_response(
+            f"Too many documents ({len(files)}); the limit is {BULK_MAX_DOCUMENTS} per command.",
+            ephemeral=True
+        )
+
+    return start_bulk_job({
+        'kind': 'import',
+        'items': [{'id': f['id'], 'name': f['name']} for f in files],
+        'skipped': [],
+        'user_name': user_name,
+        'channel_name': channel_name,
+        'response_url': response_url,
+    })
+
+
+def start_bulk_job(job):
+    """
+    Hand a bulk job to an async invocation of this function and acknowledge.
+
+    The summary is posted to the command's response_url when the job ends.
+    Without a response_url, or outside Lambda, the job runs inline within
+    BULK_INLINE_SECONDS and its summary is the reply.
+    """
+    function_name = os.environ.get('AWS_LAMBDA_FUNCTION_NAME', '')
+    if job['response_url'] and function_name:
+        try:
+            get_boto3_client('lambda').invoke(
+                FunctionName=function_name,
+                InvocationType='Event',
+                Payload=json.dumps({'bulk_job': job}).encode('utf-8')
+            )
+            return mattermost_response(
+                f"Working on {len(job['items'])} documents… a summary will be posted here when done.",
+                ephemeral=True
+            )
+        except Exception as e:
+            logger.error(f"Failed to start async bulk job, running inline: {str(e)}", exc_info=True)
+
+    text, ephemeral = run_bulk_job(job, time.time() + BULK_INLINE_SECONDS)
+    return mattermost_response(text, ephemeral=ephemeral)
+
+
+def handle_bulk_job(job, context):
+    """Run a bulk job in an async invocation and post its summary."""
+    remaining = context.get_remaining_time_in_millis() / 1000 if context else BULK_INLINE_SECONDS
+    # Leave time to post the summary before Lambda stops the invocation
+    text, ephemeral = run_bulk_job(job, time.time() + remaining - BULK_REPORT_SECONDS)
+
+    if not post_to_response_url(job['response_url'], text, ephemeral):
+        logger.error(f"Bulk job summary could not be delivered:\n{text}")
+    return {"status": "done"}
+
+
+def run_bulk_job(job, deadline):
+    """Create or import the job's documents before deadline; return the summary."""
+    user_name, channel_name = job['user_name'], job['channel_name']
+
+    if job['kind'] == 'bulk':
+        titles = [title for title, _ in job['items']]
+
+        def work(document, timeout):
+            title, content = document
+            content = content or f"Created by {user_name} from Mattermost #{channel_name}"
+            return create_outline_document(title, content, user_name, channel_name, timeout)
+    else:
+        titles = [file_info['name'] for file_info in job['items']]
+
+        def work(file_info, timeout):
+            return import_mattermost_file(file_info, user_name, channel_name, timeout)
+
+    results = run_bounded(work, job['items'], deadline)
+    return bulk_summary(titles, results, user_name, channel_name, job['skipped'])
+
+
+# Result markers for bulk items not started, or not finished, by the deadline
+NOT_ATTEMPTED = 'not attempted'
+UNFINISHED = 'unfinished'
+
+
+def run_bounded(func, items, deadline):
+    """
+    Apply func(item, timeout) with at most BULK_MAX_CONCURRENCY in flight.
+
+    Returns when every item is done or at deadline, whichever comes first.
+    The timeout passed to func only bounds each socket operation, so the
+    deadline is enforced here: items not started by then, or that would
+    start with less than BULK_MIN_ITEM_SECONDS left, come back as
+    NOT_ATTEMPTED, and items still running come back as UNFINISHED (they
+    may yet complete in Outline). Order is kept.
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait
+
+    def run(item):
+        remaining = deadline - time.time()
+        if remaining < BULK_MIN_ITEM_SECONDS:
+            return NOT_ATTEMPTED
+        return func(item, remaining)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, BULK_MAX_CONCURRENCY))
+    futures = [executor.submit(run, item) for item in items]
+    wait(futures, timeout=max(0, deadline - time.time()))
+    # Do not wait for calls still in flight; drop the ones not yet started
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for future in futures:
+        if future.cancelled():
+            results.append(NOT_ATTEMPTED)
+        elif not future.done():
+            results.append(UNFINISHED)
+        elif future.exception() is not None:
+            logger.error(f"Bulk item failed: {future.exception()}")
+            results.append(None)
+        else:
+            results.append(future.result())
+    return results
+
+
+def bulk_summary(titles, results, user_name, channel_name, skipped=()):
+    """Build one summary of created, failed, unfinished, not attempted and skipped documents."""
+    markers = (NOT_ATTEMPTED, UNFINISHED)
+    created = [(title, url) for title, url in zip(titles, results) if url and url not in markers]
+    failed = [title for title, url in zip(titles, results) if not url]
+    unfinished = [title for title, url in zip(titles, results) if url == UNFINISHED]
+    not_attempted = [title for title, url in zip(titles, results) if url == NOT_ATTEMPTED]
+
+    lines = [f"**Created {len(created)} of {len(results)} documents:**"]
+    lines.extend(f"- [{title}]({url})" for title, url in created)
+    if failed:
+        lines.append("\n**Failed** (check Lambda logs for details):")
+        lines.extend(f"- {title}" for title in failed)
+    if unfinished:
+        lines.append("\n**Unknown** (still running at the deadline; check Outline before running these again):")
+        lines.extend(f"- {title}" for title in unfinished)
+    if not_attempted:
+        lines.append("\n**Not attempted** (ran out of time; run these again):")
+        lines.extend(f"- {title}" for title in not_attempted)
+    if skipped:
+        lines.append("\n**Skipped** (not in `\"Title\" \"Content\"` form):")
+        lines.extend(f"- `{line[:100]}`" for line in skipped)
+    lines.append(f"\n_Created by {user_name} from #{channel_name}_")
+
+    return '\n'.join(lines), not created
+
+
+def handle_search_command(query):
+    """Answer `/outline search <query>` from the metadata cache."""
+    if not query:
+        return mattermost_response("Usage: `/outline search <query>`", ephemeral=True)
+
+    if not ensure_metadata_cache():
+        return mattermost_response(
+            "Failed to load documents from Outline. Check Lambda logs for details.",
+            ephemeral=True
+        )
+
+    documents = search_cached_documents(query)
+    if not documents:
+        return mattermost_response(f"No documents found for `{query}`.", ephemeral=True)
+
+    return mattermost_response(
+        f"**Documents matching** `{query}`:\n{format_document_list(documents)}",
+        ephemeral=True
+    )
+
+
+def handle_recent_command(argument):
+    """Answer `/outline recent [count]` from the metadata cache."""
+    count = SEARCH_RESULT_LIMIT
+    if argument:
+        if not argument.isdigit() or int(argument) < 1:
+            return mattermost_response("Usage: `/outline recent [count]`", ephemeral=True)
+        count = min(int(argument), 50)
+
+    if not ensure_metadata_cache():
+        return mattermost_response(
+            "Failed to load documents from Outline. Check Lambda logs for details.",
+            ephemeral=True
+        )
+
+    documents = sorted(
+        metadata_cache['documents'].values(),
+        key=lambda doc: doc['updatedAt'],
+        reverse=True
+    )[:count]
+    if not documents:
+        return mattermost_response("No documents found.", ephemeral=True)
+
+    return mattermost_response(
+        f"**Recently updated documents:**\n{format_document_list(documents)}",
+        ephemeral=True
+    )
+
+
+def format_document_list(documents):
+    """Format cached documents as a markdown list with collection names."""
+    outline_base_url = os.environ.get('OUTLINE_BASE_URL', '')
+    lines = []
+    for doc in documents:
+        collection = metadata_cache['collections'].get(doc['collectionId'], '')
+        suffix = f" _({collection})_" if collection else ''
+        lines.append(f"- [{doc['title']}]({outline_base_url}{doc['url']}){suffix}")
+    return '\n'.join(lines)
+
+
 def handle_outline_webhook(event):
     """
     Handle Outline webhook to notify Mattermost.
@@ -140,13 +669,7 @@ def handle_outline_webhook(event):
     Outline sends webhooks for: documents.publish, documents.update, etc.
     """
     try:
-        body = event.get('body', '{}')
-
-        # Handle base64 encoded body
-        if event.get('isBase64Encoded', False):
-            import base64
-            body = base64.b64decode(body).decode('utf-8')
-
+        body = decode_body(event, '{}')
         payload = json.loads(body)
 
         event_type = payload.get('event', '')
@@ -161,6 +684,9 @@ def handle_outline_webhook(event):
 
         logger.info(f"Outline webhook: {event_type} - {doc_title}")
 
+        # Keep the search cache in step with Outline
+        apply_webhook_to_cache(event_type, model)
+
         # Build notification message based on event type
         if 'publish' in event_type:
             emoji = ":rocket:"
@@ -194,7 +720,7 @@ def handle_outline_webhook(event):
         return response(500, {"error": str(e)})
 
 
-def create_outline_document(title, content, user_name, channel_name):
+def create_outline_document(title, content, user_name, channel_name, timeout=CREATE_TIMEOUT_SECONDS):
     """Create a document in Outline via API."""
     try:
         outline_base_url = os.environ.get('OUTLINE_BASE_URL', '')
@@ -208,7 +734,12 @@ def create_outline_document(title, content, user_name, channel_name):
         url = f"{outline_base_url}/api/documents.create"
 
         # Append attribution to content
-        full_content = f"{content}\n\n---\n_Created via Mattermost by {user_name} in #{channel_name}_"
+        full_content = f"{content}\n\n---\n{attribution_footer(user_name, channel_name)}"
+
+        # Large bodies go through the import API instead of a JSON payload
+        if len(full_content.encode('utf-8')) > IMPORT_THRESHOLD_BYTES:
+            body = f"# {title}\n\n{full_content}".encode('utf-8')
+            return import_outline_document(f"{title}.md", [body], len(body), timeout)
 
         data = json.dumps({
             "title": title,
@@ -227,7 +758,7 @@ def create_outline_document(title, content, user_name, channel_name):
             method='POST'
         )
 
-        with urllib.request.urlopen(req, timeout=10) as resp:
+        with urllib.request.urlopen(req, timeout=min(timeout, CREATE_TIMEOUT_SECONDS)) as resp:
             result = json.loads(resp.read().decode())
             doc_path = result.get('data', {}).get('url', '')
             if doc_path:
@@ -242,6 +773,348 @@ def create_outline_document(title, content, user_name, channel_name):
         return None
 
 
+def attribution_footer(user_name, channel_name):
+    """Attribution line appended to documents created from Mattermost."""
+    return f"_Created via Mattermost by {user_name} in #{channel_name}_"
+
+
+def import_outline_document(filename, chunks, size=None, timeout=IMPORT_TIMEOUT_SECONDS):
+    """
+    Stream a markdown file into Outline's documents.import API.
+
+    The multipart body is sent as an iterator of chunks, so the document is
+    never held in memory as a whole. Pass size when known so the request can
+    carry a Content-Length; otherwise it is sent with chunked encoding.
+    """
+    try:
+        outline_base_url = os.environ.get('OUTLINE_BASE_URL', '')
+        outline_api_key = get_outline_api_key()
+        collection_id = os.environ.get('OUTLINE_COLLECTION_ID', '')
+
+        if not all([outline_base_url, outline_api_key, collection_id]):
+            logger.error("Missing Outline configuration")
+            return None
+
+        boundary = uuid.uuid4().hex
+        safe_name = filename.replace('"', '').replace('\r', '').replace('\n', '')
+        head = (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="collectionId"\r\n\r\n{collection_id}\r\n'
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="publish"\r\n\r\ntrue\r\n'
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="file"; filename="{safe_name}"\r\n'
+            f'Content-Type: text/markdown\r\n\r\n'
+        ).encode('utf-8')
+        tail = f'\r\n--{boundary}--\r\n'.encode('utf-8')
+
+        headers = {
+            'Authorization': f'Bearer {outline_api_key}',
+            'Content-Type': f'multipart/form-data; boundary={boundary}'
+        }
+        if size is not None:
+            headers['Content-Length'] = str(len(head) + size + len(tail))
+
+        req = urllib.request.Request(
+            f"{outline_base_url}/api/documents.import",
+            data=itertools.chain([head], chunks, [tail]),
+            headers=headers,
+            method='POST'
+        )
+
+        with urllib.request.urlopen(req, timeout=min(timeout, IMPORT_TIMEOUT_SECONDS)) as resp:
+            result = json.loads(resp.read().decode())
+            doc_path = result.get('data', {}).get('url', '')
+            if doc_path:
+                return f"{outline_base_url}{doc_path}"
+            return None
+
+    except urllib.error.HTTPError as e:
+        logger.error(f"Outline import error: {e.code} - {e.read().decode()}")
+        return None
+    except Exception as e:
+        logger.error(f"Error importing document: {str(e)}", exc_info=True)
+        return None
+
+
+def mattermost_api_request(path, timeout=10):
+    """Open an authenticated GET request against the Mattermost REST API."""
+    mattermost_base_url = os.environ.get('MATTERMOST_BASE_URL', '')
+    bot_token = get_mattermost_bot_token()
+
+    if not all([mattermost_base_url, bot_token]):
+        raise RuntimeError("Missing Mattermost API configuration")
+
+    req = urllib.request.Request(
+        f"{mattermost_base_url}/api/v4/{path}",
+        headers={'Authorization': f'Bearer {bot_token}'}
+    )
+    return urllib.request.urlopen(req, timeout=min(timeout, 10))
+
+
+def user_can_read_post(user_id, post_id):
+    """Check that a post exists and the user is a member of its channel."""
+    try:
+        with mattermost_api_request(f"posts/{post_id}") as resp:
+            channel_id = json.loads(resp.read().decode()).get('channel_id', '')
+        if not channel_id:
+            return False
+        member_path = f"channels/{channel_id}/members/{urllib.parse.quote(user_id, safe='')}"
+        with mattermost_api_request(member_path):
+            return True
+    except urllib.error.HTTPError as e:
+        # Unknown post, or the user is not a channel member
+        if e.code in (403, 404):
+            return False
+        raise
+
+
+def list_markdown_attachments(post_id):
+    """Return file info for the markdown attachments of a Mattermost post."""
+    with mattermost_api_request(f"posts/{post_id}/files/info") as resp:
+        files = json.loads(resp.read().decode())
+    return [f for f in files if f.get('extension', '').lower() in MARKDOWN_EXTENSIONS]
+
+
+def import_mattermost_file(file_info, user_name, channel_name, timeout=IMPORT_TIMEOUT_SECONDS):
+    """Stream a Mattermost file attachment into Outline, adding attribution."""
+    footer = f"\n\n---\n{attribution_footer(user_name, channel_name)}\n".encode('utf-8')
+
+    try:
+        with mattermost_api_request(f"files/{file_info['id']}", timeout) as download:
+            length = download.headers.get('Content-Length')
+            size = int(length) + len(footer) if length else None
+            chunks = itertools.chain(
+                iter(lambda: download.read(STREAM_CHUNK_SIZE), b''),
+                [footer]
+            )
+            return import_outline_document(file_info['name'], chunks, size, timeout)
+    except urllib.error.HTTPError as e:
+        logger.error(f"Mattermost file download error: {e.code} - {e.read().decode()}")
+        return None
+    except Exception as e:
+        logger.error(f"Error importing attachment {file_info.get('name')}: {str(e)}", exc_info=True)
+        return None
+
+
+def outline_api_request(endpoint, payload):
+    """POST to an Outline API endpoint and return the decoded JSON response."""
+    outline_base_url = os.environ.get('OUTLINE_BASE_URL', '')
+    outline_api_key = get_outline_api_key()
+
+    if not all([outline_base_url, outline_api_key]):
+        raise RuntimeError("Missing Outline configuration")
+
+    req = urllib.request.Request(
+        f"{outline_base_url}/api/{endpoint}",
+        data=json.dumps(payload).encode('utf-8'),
+        headers={
+            'Authorization': f'Bearer {outline_api_key}',
+            'Content-Type': 'application/json'
+        },
+        method='POST'
+    )
+
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return json.loads(resp.read().decode())
+
+
+def iter_outline_pages(endpoint, max_items, extra=None):
+    """
+    Yield up to max_items records from a paginated Outline list endpoint.
+
+    Pages are fetched one at a time as the caller consumes them, so only one
+    page of API responses (which include full document bodies) is in memory.
+    """
+    offset = 0
+    while offset < max_items:
+        payload = dict(extra or {}, offset=offset, limit=OUTLINE_PAGE_SIZE)
+        page = outline_api_request(endpoint, payload).get('data', [])
+        yield from page[:max_items - offset]
+        offset += len(page)
+        if len(page) < OUTLINE_PAGE_SIZE:
+            break
+
+
+def searchable_collection_ids():
+    """
+    Return the ids of the collections search and recent may show.
+
+    The API key can usually read far more than any one Mattermost user, and
+    results go to whoever runs the command, so only collections listed in
+    OUTLINE_SEARCH_COLLECTION_IDS (default: OUTLINE_COLLECTION_ID) are cached.
+    """
+    configured = os.environ.get('OUTLINE_SEARCH_COLLECTION_IDS', '') or os.environ.get('OUTLINE_COLLECTION_ID', '')
+    return [collection_id.strip() for collection_id in configured.split(',') if collection_id.strip()]
+
+
+def ensure_metadata_cache():
+    """
+    Refresh the metadata cache if it is empty, stale or older than the TTL.
+
+    The new index is built into a separate structure and swapped in only
+    when the whole refresh succeeds. If it fails, the previous data keeps
+    being served and no new refresh is tried for CACHE_RETRY_SECONDS.
+    Returns False only when there is no data at all to answer from.
+    """
+    now = time.time()
+    has_data = metadata_cache['loaded_at'] > 0
+    if has_data and not metadata_cache['stale'] and now - metadata_cache['loaded_at'] < CACHE_TTL_SECONDS:
+        return True
+
+    if now - metadata_cache['failed_at'] < CACHE_RETRY_SECONDS:
+        return has_data
+
+    collection_ids = searchable_collection_ids()
+    staging = new_metadata_cache()
+    try:
+        for collection in iter_outline_pages('collections.list', CACHE_MAX_COLLECTIONS):
+            if collection['id'] in collection_ids:
+                staging['collections'][collection['id']] = collection.get('name', '')
+        for collection_id in collection_ids:
+            documents = iter_outline_pages(
+                'documents.list',
+                CACHE_MAX_DOCUMENTS - len(staging['documents']),
+                {'collectionId': collection_id, 'sort': 'updatedAt', 'direction': 'DESC'}
+            )
+            for doc in documents:
+                cache_document(doc, staging)
+    except urllib.error.HTTPError as e:
+        logger.error(f"Outline API error: {e.code} - {e.read().decode()}")
+        metadata_cache['failed_at'] = now
+        return has_data
+    except Exception as e:
+        logger.error(f"Error refreshing Outline cache: {str(e)}", exc_info=True)
+        metadata_cache['failed_at'] = now
+        return has_data
+
+    staging['loaded_at'] = time.time()
+    metadata_cache.update(staging)
+
+    logger.info(
+        f"Refreshed Outline cache: {len(staging['collections'])} collections, "
+        f"{len(staging['documents'])} documents"
+    )
+    return True
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def cache_document(model, cache=None):
+    """Insert or replace a document in the metadata cache and title index."""
+    cache = metadata_cache if cache is None else cache
+    doc_id = model.get('id')
+    if not doc_id:
+        return
+
+    # The path is appended to OUTLINE_BASE_URL, so anything else (such as
+    # "@evil.example/x") could turn search results into links off-site
+    url = model.get('url', '')
+    if not url.startswith('/'):
+        logger.warning(f"Not caching document {doc_id} with unexpected url {url[:100]!r}")
+        return
+
+    uncache_document(doc_id, cache)
+
+    doc = {
+        'id': doc_id,
+        'title': model.get('title') or 'Untitled',
+        'url': url,
+        'collectionId': model.get('collectionId', ''),
+        'updatedAt': model.get('updatedAt', ''),
+    }
+    cache['documents'][doc_id] = doc
+
+    for token in set(tokenize(doc['title'])):
+        ids = cache['tokens'].get(token)
+        if ids is None:
+            ids = cache['tokens'][token] = set()
+            bisect.insort(cache['sorted_tokens'], token)
+        ids.add(doc_id)
+
+
+def uncache_document(doc_id, cache=None):
+    """Remove a document from the metadata cache and title index."""
+    cache = metadata_cache if cache is None else cache
+    doc = cache['documents'].pop(doc_id, None)
+    if not doc:
+        return
+
+    for token in set(tokenize(doc['title'])):
+        ids = cache['tokens'].get(token)
+        if ids is None:
+            continue
+        ids.discard(doc_id)
+        if not ids:
+            del cache['tokens'][token]
+            index = bisect.bisect_left(cache['sorted_tokens'], token)
+            del cache['sorted_tokens'][index]
+
+
+def ids_for_token_prefix(prefix):
+    """Return ids of documents with a title token starting with prefix."""
+    sorted_tokens = metadata_cache['sorted_tokens']
+    ids = set()
+    index = bisect.bisect_left(sorted_tokens, prefix)
+    while index < len(sorted_tokens) and sorted_tokens[index].startswith(prefix):
+        ids |= metadata_cache['tokens'][sorted_tokens[index]]
+        index += 1
+    return ids
+
+
+def search_cached_documents(query, limit=SEARCH_RESULT_LIMIT):
+    """
+    Search cached document titles.
+
+    Every query token must prefix-match a title token. Exact title matches
+    rank first, then titles starting with the query, then the most recently
+    updated documents.
+    """
+    query_tokens = tokenize(query)
+    if not query_tokens:
+        return []
+
+    matches = None
+    for token in query_tokens:
+        ids = ids_for_token_prefix(token)
+        matches = ids if matches is None else matches & ids
+        if not matches:
+            return []
+
+    needle = query.strip().lower()
+
+    def rank(doc):
+        title = doc['title'].lower()
+        return (title != needle, not title.startswith(needle))
+
+    documents = [metadata_cache['documents'][doc_id] for doc_id in matches]
+    documents.sort(key=lambda doc: doc['updatedAt'], reverse=True)
+    documents.sort(key=rank)
+    return documents[:limit]
+
+
+def apply_webhook_to_cache(event_type, model):
+    """Update or invalidate the metadata cache from an Outline webhook."""
+    if not metadata_cache['loaded_at']:
+        # Nothing cached yet; the next lookup loads fresh data anyway
+        return
+
+    if event_type.startswith('documents.'):
+        # Go by the document's state rather than the event name, so events
+        # such as permanent_delete or move cannot bring a removed one back
+        removed = model.get('deletedAt') or model.get('archivedAt') or not model.get('publishedAt')
+        if removed or model.get('collectionId') not in searchable_collection_ids():
+            uncache_document(model.get('id'))
+        else:
+            cache_document(model)
+    elif event_type.startswith('collections.'):
+        # Collection changes can move or hide many documents; reload lazily
+        metadata_cache['stale'] = True
+
+
 def send_mattermost_notification(message):
     """Send a notification to Mattermost via incoming webhook."""
     try:
@@ -272,6 +1145,33 @@ def send_mattermost_notification(message):
         return False
 
 
+def post_to_response_url(response_url, text, ephemeral=False):
+    """Send a delayed slash command reply through the command's response_url."""
+    if not is_mattermost_url(response_url):
+        logger.error(f"Refusing to post to response_url outside Mattermost: {response_url[:100]}")
+        return False
+
+    try:
+        data = json.dumps({
+            "response_type": "ephemeral" if ephemeral else "in_channel",
+            "text": text
+        }).encode('utf-8')
+
+        req = urllib.request.Request(
+            response_url,
+            data=data,
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status == 200
+
+    except Exception as e:
+        logger.error(f"Error posting to response_url: {str(e)}", exc_info=True)
+        return False
+
+
 def mattermost_response(text, ephemeral=False):
     """Build a Mattermost slash command response."""
     body = {
@@ -290,3 +1190,11 @@ def response(status_code, body):
         },
         "body": json.dumps(body)
     }
+
+
+# Rest of the module body (constants, patterns, definitions), excluding
+# the stdlib imports before it and the eager warm-up after it
+init_timings['module init'] = round((time.perf_counter() - STDLIB_IMPORTED) * 1000, 2)
+
+if EAGER_INIT:
+    warm_up()
@@ -4,10 +4,11 @@
 # Handles bi-directional integration between Mattermost and Outline
 
 locals {
-  name_prefix   = "${var.project}-${var.environment}"
-  function_name = "${local.name_prefix}-mm-outline-bridge"
-  domain        = "bridge.${var.environment}.${var.domain_name}"
-  outline_url   = var.outline_base_url != "" ? var.outline_base_url : "https://wiki.${var.environment}.${var.domain_name}"
+  name_prefix    = "${var.project}-${var.environment}"
+  function_name  = "${local.name_prefix}-mm-outline-bridge"
+  domain         = "bridge.${var.environment}.${var.domain_name}"
+  outline_url    = var.outline_base_url != "" ? var.outline_base_url : "https://wiki.${var.environment}.${var.domain_name}"
+  mattermost_url = var.mattermost_base_url != "" ? var.mattermost_base_url : "https://mm.${var.environment}.${var.domain_name}"
 }
 
 data "aws_caller_identity" "current" {}
@@ -52,9 +53,21 @@ data "aws_iam_policy_document" "bridge_lambda" {
     actions = [
       "secretsmanager:GetSecretValue"
     ]
-    resources = [
+    resources = compact([
       var.outline_api_key_secret_arn,
-      var.mattermost_webhook_secret_arn
+      var.mattermost_webhook_secret_arn,
+      var.mattermost_bot_token_secret_arn,
+      var.mattermost_slash_token_secret_arn
+    ])
+  }
+
+  # Bulk commands hand their work to an async invocation of this function
+  statement {
+    actions = [
+      "lambda:InvokeFunction"
+    ]
+    resources = [
+      "arn:aws:lambda:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:function:${local.function_name}"
     ]
   }
 }
@@ -86,12 +99,24 @@ resource "aws_lambda_function" "bridge" {
   filename         = data.archive_file.bridge_lambda.output_path
   source_code_hash = data.archive_file.bridge_lambda.output_base64sha256
 
+  # Provisioned concurrency requires a published version behind an alias
+  publish = var.provisioned_concurrency > 0
+
   environment {
     variables = {
       OUTLINE_API_KEY_SECRET_ARN    = var.outline_api_key_secret_arn
       MATTERMOST_WEBHOOK_SECRET_ARN = var.mattermost_webhook_secret_arn
       OUTLINE_BASE_URL              = local.outline_url
       OUTLINE_COLLECTION_ID         = var.outline_collection_id
+      OUTLINE_CACHE_TTL_SECONDS     = tostring(var.outline_cache_ttl_seconds)
+      OUTLINE_SEARCH_COLLECTION_IDS = join(",", var.outline_search_collection_ids)
+
+      # Bulk create and attachment import
+      MATTERMOST_BASE_URL             = local.mattermost_url
+      MATTERMOST_BOT_TOKEN_SECRET_ARN   = var.mattermost_bot_token_secret_arn
+      MATTERMOST_SLASH_TOKEN_SECRET_ARN = var.mattermost_slash_token_secret_arn
+      BULK_MAX_DOCUMENTS                = tostring(var.bulk_max_documents)
+      BULK_MAX_CONCURRENCY              = tostring(var.bulk_max_concurrency)
     }
   }
 
@@ -100,6 +125,30 @@ resource "aws_lambda_function" "bridge" {
   })
 }
 
+# Optional pre-initialized containers; index.py loads boto3 and secrets during
+# init when AWS_LAMBDA_INITIALIZATION_TYPE is provisioned-concurrency
+resource "aws_lambda_alias" "live" {
+  count = var.provisioned_concurrency > 0 ? 1 : 0
+
+  name             = "live"
+  function_name    = aws_lambda_function.bridge.function_name
+  function_version = aws_lambda_function.bridge.version
+}
+
+resource "aws_lambda_provisioned_concurrency_config" "live" {
+  count = var.provisioned_concurrency > 0 ? 1 : 0
+
+  function_name                     = aws_lambda_function.bridge.function_name
+  qualifier                         = aws_lambda_alias.live[0].name
+  provisioned_concurrent_executions = var.provisioned_concurrency
+}
+
+# A retried bulk job would create its documents twice
+resource "aws_lambda_function_event_invoke_config" "bridge" {
+  function_name          = aws_lambda_function.bridge.function_name
+  maximum_retry_attempts = 0
+}
+
 resource "aws_cloudwatch_log_group" "lambda" {
   name              = "/aws/lambda/${local.function_name}"
   retention_in_days = var.log_retention_days
@@ -158,7 +207,7 @@ resource "aws_cloudwatch_log_group" "api_gateway" {
 resource "aws_apigatewayv2_integration" "lambda" {
   api_id                 = aws_apigatewayv2_api.bridge.id
   integration_type       = "AWS_PROXY"
-  integration_uri        = aws_lambda_function.bridge.invoke_arn
+  integration_uri        = var.provisioned_concurrency > 0 ? aws_lambda_alias.live[0].invoke_arn : aws_lambda_function.bridge.invoke_arn
   integration_method     = "POST"
   payload_format_version = "2.0"
 }
@@ -173,6 +222,7 @@ resource "aws_lambda_permission" "api_gateway" {
   statement_id  = "AllowAPIGateway"
   action        = "lambda:InvokeFunction"
   function_name = aws_lambda_function.bridge.function_name
+  qualifier     = var.provisioned_concurrency > 0 ? aws_lambda_alias.live[0].name : null
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_apigatewayv2_api.bridge.execution_arn}/*/*"
 }
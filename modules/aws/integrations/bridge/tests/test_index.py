@@ -0,0 +1,505 @@
+"""
+Unit tests for the bridge Lambda.
+
+Run from modules/aws/integrations/bridge:
+    python3 -m pytest -q tests
+    python3 -m unittest discover tests
+"""
+
+import io
+import json
+import os
+import sys
+import threading
+import time
+import types
+import unittest
+import urllib.error
+import urllib.parse
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda'))
+
+import index  # noqa: E402
+
+
+def document(doc_id, title, updated_at='2026-01-01T00:00:00Z', **extra):
+    """Build an Outline document model as returned by the API and webhooks."""
+    return dict(
+        {
+            'id': doc_id,
+            'title': title,
+            'url': f'/doc/{doc_id}',
+            'collectionId': 'collection',
+            'updatedAt': updated_at,
+            'publishedAt': '2026-01-01T00:00:00Z',
+        },
+        **extra
+    )
+
+
+class CacheTestCase(unittest.TestCase):
+    """Start every test from a loaded, empty metadata cache."""
+
+    def setUp(self):
+        index.metadata_cache.update(index.new_metadata_cache())
+        index.metadata_cache['loaded_at'] = time.time()
+        patch = mock.patch.dict(os.environ, {
+            'OUTLINE_COLLECTION_ID': 'collection',
+            'OUTLINE_SEARCH_COLLECTION_IDS': '',
+        })
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def titles(self, query):
+        return [doc['title'] for doc in index.search_cached_documents(query)]
+
+
+class SearchTest(CacheTestCase):
+
+    def test_token_prefix_match(self):
+        index.cache_document(document('a', 'Deployment Runbook'))
+        index.cache_document(document('b', 'Release notes'))
+
+        self.assertEqual(self.titles('deploy'), ['Deployment Runbook'])
+        self.assertEqual(self.titles('RUN'), ['Deployment Runbook'])
+        self.assertEqual(self.titles('ploy'), [])
+
+    def test_every_query_token_must_match(self):
+        index.cache_document(document('a', 'Incident postmortem'))
+        index.cache_document(document('b', 'Incident review'))
+
+        self.assertEqual(self.titles('inc post'), ['Incident postmortem'])
+        self.assertEqual(self.titles('incident missing'), [])
+
+    def test_ranking(self):
+        index.cache_document(document('old-other', 'Sprint planning notes', '2026-01-01T00:00:00Z'))
+        index.cache_document(document('new-other', 'Q3 sprint planning', '2026-03-01T00:00:00Z'))
+        index.cache_document(document('prefix', 'Planning sprint 12', '2026-02-01T00:00:00Z'))
+        index.cache_document(document('exact', 'Sprint planning', '2025-01-01T00:00:00Z'))
+
+        self.assertEqual(
+            self.titles('sprint planning'),
+            ['Sprint planning', 'Sprint planning notes', 'Q3 sprint planning', 'Planning sprint 12'],
+        )
+
+    def test_limit(self):
+        for n in range(5):
+            index.cache_document(document(str(n), f'Meeting {n}', f'2026-01-0{n + 1}T00:00:00Z'))
+
+        results = index.search_cached_documents('meeting', limit=2)
+        self.assertEqual([doc['id'] for doc in results], ['4', '3'])
+
+    def test_empty_query(self):
+        index.cache_document(document('a', 'Anything'))
+
+        self.assertEqual(index.search_cached_documents('  '), [])
+
+
+class WebhookCacheTest(CacheTestCase):
+
+    def test_publish_inserts(self):
+        index.apply_webhook_to_cache('documents.publish', document('a', 'Security review'))
+
+        self.assertEqual(self.titles('secur'), ['Security review'])
+
+    def test_update_replaces_title_tokens(self):
+        index.cache_document(document('a', 'Old title'))
+        index.apply_webhook_to_cache('documents.update', document('a', 'New heading'))
+
+        self.assertEqual(self.titles('old'), [])
+        self.assertEqual(self.titles('heading'), ['New heading'])
+        self.assertNotIn('old', index.metadata_cache['sorted_tokens'])
+
+    def test_removed_states(self):
+        for event_type, state in (
+            ('documents.delete', {'deletedAt': '2026-02-01T00:00:00Z'}),
+            ('documents.archive', {'archivedAt': '2026-02-01T00:00:00Z'}),
+            ('documents.unpublish', {'publishedAt': None}),
+            ('documents.update', {'publishedAt': None}),
+        ):
+            with self.subTest(event_type=event_type):
+                index.cache_document(document('a', 'Roadmap'))
+                index.apply_webhook_to_cache(event_type, document('a', 'Roadmap', **state))
+
+                self.assertEqual(self.titles('roadmap'), [])
+                self.assertNotIn('a', index.metadata_cache['documents'])
+
+    def test_permanent_delete_after_delete_stays_removed(self):
+        index.cache_document(document('a', 'Roadmap'))
+        deleted = document('a', 'Roadmap', deletedAt='2026-02-01T00:00:00Z')
+        index.apply_webhook_to_cache('documents.delete', deleted)
+        index.apply_webhook_to_cache('documents.permanent_delete', deleted)
+
+        self.assertEqual(self.titles('roadmap'), [])
+
+    def test_model_without_publish_state_is_not_cached(self):
+        index.apply_webhook_to_cache('documents.permanent_delete', {'id': 'a', 'title': 'Roadmap'})
+
+        self.assertEqual(self.titles('roadmap'), [])
+
+    def test_unarchive_adds_back(self):
+        index.apply_webhook_to_cache('documents.unarchive', document('a', 'Roadmap'))
+
+        self.assertEqual(self.titles('roadmap'), ['Roadmap'])
+
+    def test_url_must_be_a_path(self):
+        index.apply_webhook_to_cache('documents.publish', document('a', 'Roadmap'))
+        for url in ('@evil.example/x', 'https://evil.example/x', ''):
+            with self.subTest(url=url):
+                index.apply_webhook_to_cache('documents.update', document('b', 'Roadmap v2', url=url))
+
+                self.assertEqual(self.titles('roadmap'), ['Roadmap'])
+                self.assertEqual(index.metadata_cache['documents']['a']['url'], '/doc/a')
+
+    def test_other_collections_not_cached(self):
+        index.apply_webhook_to_cache('documents.publish', document('a', 'Salaries', collectionId='hr'))
+
+        self.assertEqual(self.titles('salaries'), [])
+
+    def test_moved_out_of_searchable_collection(self):
+        index.cache_document(document('a', 'Roadmap'))
+        index.apply_webhook_to_cache('documents.move', document('a', 'Roadmap', collectionId='private'))
+
+        self.assertEqual(self.titles('roadmap'), [])
+
+    def test_collection_event_marks_stale(self):
+        index.cache_document(document('a', 'Roadmap'))
+        index.apply_webhook_to_cache('collections.update', {'id': 'collection'})
+
+        self.assertTrue(index.metadata_cache['stale'])
+        self.assertEqual(self.titles('roadmap'), ['Roadmap'])
+
+    def test_ignored_before_first_load(self):
+        index.metadata_cache['loaded_at'] = 0
+        index.apply_webhook_to_cache('documents.publish', document('a', 'Roadmap'))
+
+        self.assertEqual(index.metadata_cache['documents'], {})
+
+
+class CacheRefreshTest(CacheTestCase):
+
+    def outline(self, endpoint, payload):
+        if endpoint == 'collections.list':
+            data = [{'id': 'eng', 'name': 'Engineering'}, {'id': 'hr', 'name': 'HR'}, {'id': 'ops', 'name': 'Ops'}]
+        else:
+            collection_id = payload['collectionId']
+            data = [document(f'{collection_id}-1', f'{collection_id} doc', collectionId=collection_id)]
+        return {'data': data[payload['offset']:]}
+
+    def refresh(self, **env):
+        index.metadata_cache['loaded_at'] = 0
+        with mock.patch.dict(os.environ, env), \
+                mock.patch.object(index, 'outline_api_request', side_effect=self.outline) as api:
+            self.assertTrue(index.ensure_metadata_cache())
+        return [call.args for call in api.call_args_list]
+
+    def test_defaults_to_the_default_collection(self):
+        calls = self.refresh(OUTLINE_COLLECTION_ID='eng')
+
+        self.assertEqual(index.metadata_cache['collections'], {'eng': 'Engineering'})
+        self.assertEqual(list(index.metadata_cache['documents']), ['eng-1'])
+        listed = [payload.get('collectionId') for endpoint, payload in calls if endpoint == 'documents.list']
+        self.assertEqual(listed, ['eng'])
+
+    def test_allow_list(self):
+        self.refresh(OUTLINE_COLLECTION_ID='eng', OUTLINE_SEARCH_COLLECTION_IDS='eng, ops')
+
+        self.assertEqual(index.metadata_cache['collections'], {'eng': 'Engineering', 'ops': 'Ops'})
+        self.assertEqual(sorted(index.metadata_cache['documents']), ['eng-1', 'ops-1'])
+
+
+class ParserTest(unittest.TestCase):
+
+    def test_bulk_documents(self):
+        documents, skipped = index.parse_bulk_documents(
+            '"Standup" "Notes for today"\n'
+            '\n'
+            '  "Retro"  \n'
+            'not quoted\n'
+            '"Trailing" "content" extra\n'
+        )
+
+        self.assertEqual(documents, [('Standup', 'Notes for today'), ('Retro', '')])
+        self.assertEqual(skipped, ['not quoted', '"Trailing" "content" extra'])
+
+    def test_post_ids(self):
+        first = 'a' * 26
+        second = 'b1' * 13
+        text = (
+            f'{first} https://chat.example.com/team/pl/{second} {first} '
+            f'{"c" * 27} x{"d" * 26}'
+        )
+
+        self.assertEqual(index.parse_post_ids(text), [first, second])
+
+    def test_post_ids_none(self):
+        self.assertEqual(index.parse_post_ids('import nothing here'), [])
+
+
+class ImportCommandTest(unittest.TestCase):
+
+    @mock.patch.object(index, 'BULK_MAX_DOCUMENTS', 2)
+    @mock.patch.object(index, 'mattermost_api_request')
+    def test_too_many_posts_rejected_before_any_lookup(self, api):
+        post_ids = ' '.join(f'{n:026d}' for n in range(3))
+        reply = json.loads(index.handle_import_command(post_ids, 'user', 'alice', 'town-square')['body'])
+
+        api.assert_not_called()
+        self.assertEqual(reply['text'], 'Too many posts (3); the limit is 2 per command.')
+
+
+class BulkSummaryTest(unittest.TestCase):
+
+    def test_sections(self):
+        text, ephemeral = index.bulk_summary(
+            ['One', 'Two', 'Three', 'Four'],
+            ['https://wiki/doc/one', None, index.NOT_ATTEMPTED, index.UNFINISHED],
+            'alice', 'town-square',
+            skipped=['not quoted'],
+        )
+
+        self.assertFalse(ephemeral)
+        self.assertIn('**Created 1 of 4 documents:**\n- [One](https://wiki/doc/one)', text)
+        self.assertIn('**Failed** (check Lambda logs for details):\n- Two', text)
+        self.assertIn('**Not attempted** (ran out of time; run these again):\n- Three', text)
+        self.assertIn('**Unknown** (still running at the deadline; check Outline before running these again):\n- Four', text)
+        self.assertIn('**Skipped** (not in `"Title" "Content"` form):\n- `not quoted`', text)
+        self.assertTrue(text.endswith('_Created by alice from #town-square_'))
+
+    def test_nothing_created_is_ephemeral(self):
+        text, ephemeral = index.bulk_summary(['One'], [None], 'alice', 'town-square')
+
+        self.assertTrue(ephemeral)
+        self.assertNotIn('Not attempted', text)
+        self.assertNotIn('Unknown', text)
+        self.assertNotIn('Skipped', text)
+
+
+class RunBoundedTest(unittest.TestCase):
+
+    def test_all_finish(self):
+        results = index.run_bounded(lambda item, timeout: item * 2, [1, 2, 3], time.time() + 10)
+
+        self.assertEqual(results, [2, 4, 6])
+
+    def test_exception_counts_as_failed(self):
+        def work(item, timeout):
+            if item == 2:
+                raise RuntimeError('boom')
+            return item
+
+        self.assertEqual(index.run_bounded(work, [1, 2], time.time() + 10), [1, None])
+
+    @mock.patch.object(index, 'BULK_MIN_ITEM_SECONDS', 0)
+    @mock.patch.object(index, 'BULK_MAX_CONCURRENCY', 1)
+    def test_returns_at_deadline(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def work(item, timeout):
+            release.wait(5)
+            return item
+
+        started = time.time()
+        results = index.run_bounded(work, ['slow', 'queued'], started + 0.2)
+
+        self.assertLess(time.time() - started, 1)
+        self.assertEqual(results, [index.UNFINISHED, index.NOT_ATTEMPTED])
+
+    def test_too_little_time_left(self):
+        results = index.run_bounded(lambda item, timeout: item, [1], time.time() + index.BULK_MIN_ITEM_SECONDS - 1)
+
+        self.assertEqual(results, [index.NOT_ATTEMPTED])
+
+
+def http_error(code):
+    return urllib.error.HTTPError('http://mm/api/v4/x', code, 'error', {}, io.BytesIO(b'{}'))
+
+
+class UserCanReadPostTest(unittest.TestCase):
+
+    def api(self, member_response):
+        def request(path, timeout=10):
+            if path.startswith('posts/'):
+                return io.BytesIO(json.dumps({'id': 'post', 'channel_id': 'channel'}).encode())
+            self.assertEqual(path, 'channels/channel/members/user%2Fid')
+            if isinstance(member_response, Exception):
+                raise member_response
+            return io.BytesIO(b'{}')
+        return mock.patch.object(index, 'mattermost_api_request', side_effect=request)
+
+    def test_member(self):
+        with self.api(None):
+            self.assertTrue(index.user_can_read_post('user/id', 'post'))
+
+    def test_not_member_or_unknown_post(self):
+        for code in (403, 404):
+            with self.subTest(code=code), self.api(http_error(code)):
+                self.assertFalse(index.user_can_read_post('user/id', 'post'))
+
+    def test_other_errors_propagate(self):
+        with self.api(http_error(500)), self.assertRaises(urllib.error.HTTPError):
+            index.user_can_read_post('user/id', 'post')
+
+
+class StartBulkJobTest(unittest.TestCase):
+
+    def job(self, response_url='https://mm.example.com/hooks/commands/abc'):
+        return {
+            'kind': 'bulk',
+            'items': [('One', ''), ('Two', 'body')],
+            'skipped': [],
+            'user_name': 'alice',
+            'channel_name': 'town-square',
+            'response_url': response_url,
+        }
+
+    def reply(self, result):
+        return json.loads(result['body'])
+
+    @mock.patch.object(index, 'create_outline_document', return_value='https://wiki/doc/x')
+    def test_runs_inline_outside_lambda(self, create):
+        with mock.patch.dict(os.environ, {'AWS_LAMBDA_FUNCTION_NAME': ''}):
+            reply = self.reply(index.start_bulk_job(self.job()))
+
+        self.assertEqual(create.call_count, 2)
+        self.assertIn('Created 2 of 2 documents', reply['text'])
+
+    @mock.patch.object(index, 'create_outline_document', return_value='https://wiki/doc/x')
+    def test_runs_inline_without_response_url(self, create):
+        with mock.patch.dict(os.environ, {'AWS_LAMBDA_FUNCTION_NAME': 'bridge'}), \
+                mock.patch.object(index, 'get_boto3_client') as client:
+            reply = self.reply(index.start_bulk_job(self.job(response_url='')))
+
+        client.assert_not_called()
+        self.assertIn('Created 2 of 2 documents', reply['text'])
+
+    @mock.patch.object(index, 'create_outline_document', return_value='https://wiki/doc/x')
+    def test_runs_inline_when_invoke_fails(self, create):
+        with mock.patch.dict(os.environ, {'AWS_LAMBDA_FUNCTION_NAME': 'bridge'}), \
+                mock.patch.object(index, 'get_boto3_client') as client:
+            client.return_value.invoke.side_effect = RuntimeError('throttled')
+            reply = self.reply(index.start_bulk_job(self.job()))
+
+        self.assertIn('Created 2 of 2 documents', reply['text'])
+
+    @mock.patch.object(index, 'create_outline_document')
+    def test_hands_off_to_async_invocation(self, create):
+        with mock.patch.dict(os.environ, {'AWS_LAMBDA_FUNCTION_NAME': 'bridge'}), \
+                mock.patch.object(index, 'get_boto3_client') as client:
+            reply = self.reply(index.start_bulk_job(self.job()))
+
+        create.assert_not_called()
+        kwargs = client.return_value.invoke.call_args.kwargs
+        self.assertEqual(kwargs['InvocationType'], 'Event')
+        self.assertEqual(json.loads(kwargs['Payload'])['bulk_job']['items'], [['One', ''], ['Two', 'body']])
+        self.assertEqual(reply['response_type'], 'ephemeral')
+        self.assertIn('Working on 2 documents', reply['text'])
+
+
+class LazyInitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.boto3 = types.SimpleNamespace(client=mock.Mock(side_effect=lambda service: mock.Mock(name=service)))
+        patches = [
+            mock.patch.dict(sys.modules, {'boto3': self.boto3}),
+            mock.patch.dict(index.boto3_clients, clear=True),
+            mock.patch.dict(index.init_timings, clear=True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        index.fetch_secret.cache_clear()
+        self.addCleanup(index.fetch_secret.cache_clear)
+
+    def test_boto3_client_created_once_per_service(self):
+        secretsmanager = index.get_boto3_client('secretsmanager')
+        self.assertIs(index.get_boto3_client('secretsmanager'), secretsmanager)
+        index.get_boto3_client('lambda')
+
+        self.assertEqual([c.args for c in self.boto3.client.call_args_list], [('secretsmanager',), ('lambda',)])
+
+    def test_boto3_import_recorded_once(self):
+        index.get_boto3_client('secretsmanager')
+        first = dict(index.init_timings)
+        index.get_boto3_client('secretsmanager')
+        index.get_boto3_client('lambda')
+
+        self.assertEqual(set(first), {'boto3 import', 'secretsmanager client'})
+        self.assertEqual(set(index.init_timings), {'boto3 import', 'secretsmanager client', 'lambda client'})
+        self.assertEqual(index.init_timings['boto3 import'], first['boto3 import'])
+
+    def test_failed_secret_fetch_is_retried(self):
+        client = index.get_boto3_client('secretsmanager')
+        client.get_secret_value.side_effect = [
+            RuntimeError('throttled'),
+            {'SecretString': json.dumps({'api_key': 'key'})},
+        ]
+        arn = 'arn:aws:secretsmanager:us-east-1:000000000000:secret:outline'
+
+        self.assertEqual(index.get_secret(arn, 'api_key'), '')
+        self.assertEqual(index.get_secret(arn, 'api_key'), 'key')
+        self.assertEqual(index.get_secret(arn, 'api_key'), 'key')
+        self.assertEqual(client.get_secret_value.call_count, 2)
+        self.assertIn('secret outline', index.init_timings)
+
+
+class SlashCommandAuthTest(unittest.TestCase):
+
+    def setUp(self):
+        patches = [
+            mock.patch.dict(os.environ, {'MATTERMOST_BASE_URL': 'https://mm.example.com'}),
+            mock.patch.object(index, 'get_mattermost_slash_token', return_value='secret-token'),
+            mock.patch.object(index, 'handle_bulk_command', return_value='bulk handled'),
+            mock.patch.object(index, 'handle_import_command', return_value='import handled'),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def command(self, text, **params):
+        body = urllib.parse.urlencode(dict({'text': text, 'user_id': 'user', 'user_name': 'alice'}, **params))
+        return index.handle_slash_command({'body': body})
+
+    def test_valid_token(self):
+        url = 'https://mm.example.com/hooks/commands/abc'
+        self.assertEqual(self.command('bulk\n"One"', token='secret-token', response_url=url), 'bulk handled')
+        self.assertEqual(self.command('import x', token='secret-token'), 'import handled')
+
+    def test_wrong_or_missing_token(self):
+        for params in ({'token': 'guess'}, {}):
+            for text in ('bulk\n"One"', 'import x'):
+                with self.subTest(params=params, text=text):
+                    reply = json.loads(self.command(text, **params)['body'])
+                    self.assertEqual(reply['text'], 'This command could not be verified.')
+
+    def test_token_not_configured(self):
+        with mock.patch.object(index, 'get_mattermost_slash_token', return_value=''):
+            reply = json.loads(self.command('import x', token='')['body'])
+
+        self.assertEqual(reply['text'], 'This command could not be verified.')
+
+    def test_response_url_outside_mattermost(self):
+        for url in (
+            'https://evil.example/hooks/commands/abc',
+            'https://mm.example.com.evil.example/hooks/commands/abc',
+            'https://user@evil.example/hooks/commands/abc',
+            'http://mm.example.com/hooks/commands/abc',
+        ):
+            with self.subTest(url=url):
+                reply = json.loads(self.command('bulk\n"One"', token='secret-token', response_url=url)['body'])
+                self.assertEqual(reply['text'], 'Invalid response URL.')
+
+    def test_other_commands_need_no_token(self):
+        with mock.patch.object(index, 'handle_search_command', return_value='search handled'):
+            self.assertEqual(self.command('search roadmap'), 'search handled')
+
+    @mock.patch('urllib.request.urlopen')
+    def test_post_to_response_url_refuses_other_hosts(self, urlopen):
+        self.assertFalse(index.post_to_response_url('https://evil.example/collect', 'summary'))
+        urlopen.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
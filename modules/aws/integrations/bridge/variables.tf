@@ -31,31 +31,80 @@ variable "outline_collection_id" {
   type        = string
 }
 
+variable "outline_search_collection_ids" {
+  description = "Outline collection IDs that /outline search and /outline recent may show to any Mattermost user. Defaults to outline_collection_id only"
+  type        = list(string)
+  default     = []
+}
+
 variable "outline_base_url" {
   description = "Outline base URL (e.g., https://wiki.dev.almondbread.org)"
   type        = string
   default     = ""
 }
 
+variable "outline_cache_ttl_seconds" {
+  description = "Seconds before the per-container Outline metadata cache used by search/recent is reloaded. Webhooks update only the container that receives them, so other containers can be stale for up to this long"
+  type        = number
+  default     = 300
+}
+
 # Mattermost configuration
 variable "mattermost_webhook_secret_arn" {
   description = "ARN of the Secrets Manager secret containing Mattermost incoming webhook URL (JSON with 'webhook_url' field)"
   type        = string
 }
 
+variable "mattermost_base_url" {
+  description = "Mattermost base URL for the REST API used by /outline import (e.g., https://mm.dev.almondbread.org)"
+  type        = string
+  default     = ""
+}
+
+variable "mattermost_bot_token_secret_arn" {
+  description = "ARN of the Secrets Manager secret containing a Mattermost bot access token (JSON with 'token' field). Required only for /outline import"
+  type        = string
+  default     = ""
+}
+
+variable "mattermost_slash_token_secret_arn" {
+  description = "ARN of the Secrets Manager secret containing the /outline slash command token (JSON with 'token' field). Required for /outline bulk and /outline import"
+  type        = string
+  default     = ""
+}
+
+# Bulk import configuration
+variable "bulk_max_documents" {
+  description = "Maximum number of documents accepted by a single /outline bulk or /outline import command"
+  type        = number
+  default     = 20
+}
+
+variable "bulk_max_concurrency" {
+  description = "Maximum number of documents created in Outline concurrently during bulk operations"
+  type        = number
+  default     = 4
+}
+
 # Lambda configuration
 variable "lambda_timeout" {
-  description = "Lambda function timeout in seconds"
+  description = "Lambda function timeout in seconds. Requests through API Gateway are still cut off at 30 seconds; the rest is the time budget for async bulk/import jobs"
   type        = number
-  default     = 30
+  default     = 120
 }
 
 variable "lambda_memory" {
-  description = "Lambda function memory in MB"
+  description = "Lambda function memory in MB. Search cache reloads hold one page of 100 full Outline documents at a time; use 256 if documents average several hundred KB"
   type        = number
   default     = 128
 }
 
+variable "provisioned_concurrency" {
+  description = "Number of pre-initialized Lambda containers (0 disables provisioned concurrency; containers then initialize lazily on demand)"
+  type        = number
+  default     = 0
+}
+
 variable "log_retention_days" {
   description = "CloudWatch log retention in days"
   type        = number